@@ -0,0 +1,8 @@
+from collections.abc import Mapping
+from typing import Any
+
+from sentry.hybridcloud.rpc import RpcModel
+
+
+class AvailableActions(RpcModel):
+    actions: list[Mapping[str, Any]]
@@ -2,11 +2,13 @@ from __future__ import annotations
 
 import bisect
 import logging
+from collections import defaultdict
 from collections.abc import Mapping, Sequence
 from copy import deepcopy
 from dataclasses import replace
 from datetime import datetime, timedelta, timezone
-from typing import TYPE_CHECKING, Any
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, DefaultDict
 from uuid import uuid4
 
 from django.db import router, transaction
@@ -20,8 +22,11 @@ from sentry import analytics, audit_log, features, quotas
 from sentry.api.exceptions import ResourceDoesNotExist
 from sentry.auth.access import SystemAccess
 from sentry.constants import CRASH_RATE_ALERT_AGGREGATE_ALIAS, ObjectStatus
+from sentry.hybridcloud.rpc.caching import back_with_silo_cache, region_caching_service
 from sentry.incidents import tasks
+from sentry.incidents.available_actions import AvailableActions
 from sentry.incidents.models.alert_rule import (
+    ActionHandlerFactory,
     AlertRule,
     AlertRuleActivity,
     AlertRuleActivityType,
@@ -52,19 +57,26 @@ from sentry.incidents.models.incident import (
 )
 from sentry.integrations.services.integration import RpcIntegration, integration_service
 from sentry.integrations.services.integration.model import RpcOrganizationIntegration
+from sentry.models.integrations.sentry_app_installation import prepare_ui_component
 from sentry.models.notificationaction import ActionService, ActionTarget
+from sentry.models.organization import Organization
 from sentry.models.project import Project
 from sentry.models.scheduledeletion import RegionScheduledDeletion
 from sentry.relay.config.metric_extraction import on_demand_metrics_feature_flags
 from sentry.search.events.builder.base import BaseQueryBuilder
 from sentry.search.events.fields import is_function, resolve_field
 from sentry.seer.anomaly_detection.store_data import send_historical_data_to_seer
-from sentry.sentry_apps.services.app import RpcSentryAppInstallation, app_service
+from sentry.sentry_apps.services.app import (
+    RpcSentryAppComponent,
+    RpcSentryAppInstallation,
+    app_service,
+)
 from sentry.shared_integrations.exceptions import (
     ApiTimeoutError,
     DuplicateDisplayNameError,
     IntegrationError,
 )
+from sentry.silo.base import SiloMode, region_silo_function
 from sentry.snuba.dataset import Dataset
 from sentry.snuba.entity_subscription import (
     ENTITY_TIME_COLUMNS,
@@ -85,6 +97,7 @@ from sentry.snuba.subscriptions import (
 )
 from sentry.tasks.relay import schedule_invalidate_project_config
 from sentry.types.actor import Actor
+from sentry.types.region import get_local_region
 from sentry.utils import metrics
 from sentry.utils.audit import create_audit_entry_from_user
 from sentry.utils.snuba import is_measurement
@@ -1708,6 +1721,32 @@ def get_pagerduty_services(organization_id, integration_id) -> list[tuple[int, s
     return [(s["id"], s["service_name"]) for s in services]
 
 
+def get_pagerduty_services_by_integration(
+    organization_id, integration_ids
+) -> dict[int, list[tuple[int, str]]]:
+    """
+    Batched version of `get_pagerduty_services`: looks up the services for every
+    given PagerDuty integration with a single call instead of one per integration.
+    """
+    from sentry.integrations.pagerduty.utils import get_services
+
+    services_by_integration: dict[int, list[tuple[int, str]]] = {
+        integration_id: [] for integration_id in integration_ids
+    }
+    if not services_by_integration:
+        return services_by_integration
+
+    org_integrations = integration_service.get_organization_integrations(
+        organization_id=organization_id, providers=["pagerduty"]
+    )
+    for org_int in org_integrations:
+        if org_int.integration_id in services_by_integration:
+            services_by_integration[org_int.integration_id] = [
+                (s["id"], s["service_name"]) for s in get_services(org_int)
+            ]
+    return services_by_integration
+
+
 def get_opsgenie_teams(organization_id, integration_id) -> list[tuple[str, str]]:
     org_int = integration_service.get_organization_integration(
         organization_id=organization_id, integration_id=integration_id
@@ -1721,6 +1760,184 @@ def get_opsgenie_teams(organization_id, integration_id) -> list[tuple[str, str]]
     return teams
 
 
+@lru_cache(maxsize=None)
+def _get_allowed_target_types(registered_factory: ActionHandlerFactory) -> tuple[str | None, ...]:
+    from sentry.incidents.serializers import ACTION_TARGET_TYPE_TO_STRING
+
+    # Registered factories and their supported target types are fixed for the lifetime of the
+    # process, so only translate them to strings once per factory.
+    return tuple(
+        ACTION_TARGET_TYPE_TO_STRING.get(target_type)
+        for target_type in registered_factory.supported_target_types
+    )
+
+
+@region_silo_function
+def build_action_response(
+    registered_factory: ActionHandlerFactory,
+    integration: RpcIntegration | None = None,
+    organization: Organization | None = None,
+    sentry_app_installation: RpcSentryAppInstallation | None = None,
+    pagerduty_services: list[tuple[int, str]] | None = None,
+    sentry_app_components: Mapping[str, RpcSentryAppComponent] | None = None,
+) -> Mapping[str, Any]:
+    """
+    Build the "available action" objects for the API. Each one can have different fields.
+
+    :param registered_factory: One of the registered AlertRuleTriggerAction factories.
+    :param integration: Optional. The Integration if this action uses a one.
+    :param organization: Optional. If this is a PagerDuty/Opsgenie action, we need the organization to look up services/teams.
+    :param sentry_app: Optional. The SentryApp if this action uses a one.
+    :param pagerduty_services: Optional. Prefetched PagerDuty services for the integration, to
+        avoid looking them up once per integration.
+    :param sentry_app_components: Optional. Prefetched "alert-rule-action" components keyed by
+        SentryAppInstallation uuid, to avoid looking them up once per installation.
+    :return: The available action object.
+    """
+    action_response: dict[str, Any] = {
+        "type": registered_factory.slug,
+        "allowedTargetTypes": list(_get_allowed_target_types(registered_factory)),
+    }
+
+    if integration:
+        action_response["integrationName"] = integration.name
+        action_response["integrationId"] = integration.id
+
+        if registered_factory.service_type == AlertRuleTriggerAction.Type.PAGERDUTY:
+            if pagerduty_services is None:
+                if organization is None:
+                    raise Exception("Organization is required for PAGERDUTY actions")
+                pagerduty_services = get_pagerduty_services(organization.id, integration.id)
+            action_response["options"] = [
+                {"value": id, "label": service_name} for id, service_name in pagerduty_services
+            ]
+        elif registered_factory.service_type == AlertRuleTriggerAction.Type.OPSGENIE:
+            if organization is None:
+                raise Exception("Organization is required for OPSGENIE actions")
+            action_response["options"] = [
+                {"value": id, "label": team}
+                for id, team in get_opsgenie_teams(organization.id, integration.id)
+            ]
+
+    elif sentry_app_installation:
+        action_response["sentryAppName"] = sentry_app_installation.sentry_app.name
+        action_response["sentryAppId"] = sentry_app_installation.sentry_app.id
+        action_response["sentryAppInstallationUuid"] = sentry_app_installation.uuid
+        action_response["status"] = sentry_app_installation.sentry_app.status
+
+        # Sentry Apps can be alertable but not have an Alert Rule UI Component
+        component: RpcSentryAppComponent | None
+        if sentry_app_components is None:
+            component = app_service.prepare_sentry_app_components(
+                installation_id=sentry_app_installation.id, component_type="alert-rule-action"
+            )
+        else:
+            component = sentry_app_components.get(sentry_app_installation.uuid)
+            if component:
+                component = prepare_ui_component(sentry_app_installation, component)
+        if component:
+            action_response["settings"] = component.app_schema.get("settings", {})
+
+    return action_response
+
+
+def _build_available_actions(organization: Organization) -> tuple[list[Mapping[str, Any]], bool]:
+    """
+    Returns the available actions, and whether every SentryApp UI component could be prepared.
+    """
+    actions: list[Mapping[str, Any]] = []
+    complete = True
+
+    # Cache Integration objects in this data structure to save DB calls.
+    provider_integrations: DefaultDict[str, list[RpcIntegration]] = defaultdict(list)
+    for integration in get_available_action_integrations_for_org(organization):
+        provider_integrations[integration.provider].append(integration)
+
+    # Fetch the services of every PagerDuty integration at once instead of once per integration.
+    pagerduty_services = get_pagerduty_services_by_integration(
+        organization.id,
+        [integration.id for integration in provider_integrations["pagerduty"]],
+    )
+
+    # Fetch alertable SentryApp installations and their UI components once per request.
+    alertable_installs = [
+        install
+        for install in app_service.get_installed_for_organization(organization_id=organization.id)
+        if install.sentry_app.is_alertable
+    ]
+    sentry_app_components: dict[str, RpcSentryAppComponent] = {}
+    if alertable_installs:
+        sentry_app_components = {
+            context.installation.uuid: context.component
+            for context in app_service.get_component_contexts(
+                filter={
+                    "organization_id": organization.id,
+                    "uuids": [install.uuid for install in alertable_installs],
+                },
+                component_type="alert-rule-action",
+            )
+        }
+
+    for registered_type in AlertRuleTriggerAction.get_registered_factories():
+        # Used cached integrations for each `registered_type` instead of making N calls.
+        if registered_type.integration_provider:
+            actions += [
+                build_action_response(
+                    registered_type,
+                    integration=integration,
+                    organization=organization,
+                    pagerduty_services=pagerduty_services.get(integration.id),
+                )
+                for integration in provider_integrations[registered_type.integration_provider]
+            ]
+
+        # Add all alertable SentryApps to the list.
+        elif registered_type.service_type == AlertRuleTriggerAction.Type.SENTRY_APP:
+            sentry_app_actions = [
+                build_action_response(
+                    registered_type,
+                    sentry_app_installation=install,
+                    sentry_app_components=sentry_app_components,
+                )
+                for install in alertable_installs
+            ]
+            # Preparing a component fails when the request to the SentryApp fails, in which case
+            # the action is returned without its settings.
+            complete = complete and all(
+                "settings" in action
+                for action in sentry_app_actions
+                if action["sentryAppInstallationUuid"] in sentry_app_components
+            )
+            actions += sentry_app_actions
+
+        else:
+            actions.append(build_action_response(registered_type))
+    return actions, complete
+
+
+@back_with_silo_cache("alert_rule_available_actions", SiloMode.REGION, AvailableActions, timeout=60)
+def get_available_actions(organization_id: int) -> AvailableActions:
+    """
+    Cached list of the available actions for an organization. The cache is cleared when the
+    organization's OrganizationIntegrations, SentryApps or SentryApp installations are
+    replicated to its region. Changes to the Integration rows themselves (e.g. renaming or
+    disabling an integration) aren't replicated, so those are only picked up once the
+    timeout expires.
+
+    Results where a SentryApp UI component couldn't be prepared aren't cached, so a failing
+    request to a SentryApp doesn't hide its settings from the whole organization.
+    """
+    organization = Organization.objects.get_from_cache(id=organization_id)
+    actions, complete = _build_available_actions(organization)
+    if not complete:
+        # Bumping the cache version makes the pending cache write land on a stale key.
+        region_caching_service.clear_key(
+            key=get_available_actions.key_from(organization_id),
+            region_name=get_local_region().name,
+        )
+    return AvailableActions(actions=actions)
+
+
 # TODO: This is temporarily needed to support back and forth translations for snuba / frontend.
 # Uses a function from discover to break the aggregate down into parts, and then compare the "field"
 # to a list of accepted fields, or a list of fields we need to translate.
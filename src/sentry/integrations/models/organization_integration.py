@@ -45,7 +45,12 @@ class OrganizationIntegration(ReplicatedControlModel):
         unique_together = (("organization_id", "integration"),)
 
     def handle_async_replication(self, region_name: str, shard_identifier: int) -> None:
-        pass
+        from sentry.hybridcloud.rpc.caching import region_caching_service
+        from sentry.incidents.logic import get_available_actions
+
+        region_caching_service.clear_key(
+            key=get_available_actions.key_from(self.organization_id), region_name=region_name
+        )
 
     @classmethod
     def handle_async_deletion(
@@ -55,7 +60,13 @@ class OrganizationIntegration(ReplicatedControlModel):
         shard_identifier: int,
         payload: Mapping[str, Any] | None,
     ) -> None:
-        pass
+        from sentry.hybridcloud.rpc.caching import region_caching_service
+        from sentry.incidents.logic import get_available_actions
+
+        # Outboxes for this category are sharded by organization id.
+        region_caching_service.clear_key(
+            key=get_available_actions.key_from(shard_identifier), region_name=region_name
+        )
 
     @classmethod
     def sanitize_relocation_json(
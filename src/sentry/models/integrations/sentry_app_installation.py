@@ -197,6 +197,7 @@ class SentryAppInstallation(ReplicatedControlModel, ParanoidModel):
 
     def handle_async_replication(self, region_name: str, shard_identifier: int) -> None:
         from sentry.hybridcloud.rpc.caching import region_caching_service
+        from sentry.incidents.logic import get_available_actions
         from sentry.sentry_apps.services.app.service import get_installation
 
         if self.api_token is not None:
@@ -207,6 +208,9 @@ class SentryAppInstallation(ReplicatedControlModel, ParanoidModel):
         region_caching_service.clear_key(
             key=get_installation.key_from(self.id), region_name=region_name
         )
+        region_caching_service.clear_key(
+            key=get_available_actions.key_from(self.organization_id), region_name=region_name
+        )
 
     @classmethod
     def handle_async_deletion(
@@ -216,9 +220,17 @@ class SentryAppInstallation(ReplicatedControlModel, ParanoidModel):
         shard_identifier: int,
         payload: Mapping[str, Any] | None,
     ) -> None:
+        from sentry.hybridcloud.rpc.caching import region_caching_service
+        from sentry.incidents.logic import get_available_actions
         from sentry.models.apitoken import ApiToken
 
         if payload:
+            organization_id = payload.get("organization_id", None)
+            if isinstance(organization_id, int):
+                region_caching_service.clear_key(
+                    key=get_available_actions.key_from(organization_id), region_name=region_name
+                )
+
             api_token_id = payload.get("api_token_id", None)
             user_id = payload.get("user_id", None)
             if isinstance(api_token_id, int) and isinstance(user_id, int):
@@ -233,9 +245,10 @@ class SentryAppInstallation(ReplicatedControlModel, ParanoidModel):
             return dict(
                 api_token_id=self.api_token_id,
                 user_id=self.api_token.user_id if self.api_token else None,
+                organization_id=self.organization_id,
             )
         except ApiToken.DoesNotExist:
-            return None
+            return dict(organization_id=self.organization_id)
 
 
 def prepare_sentry_app_components(
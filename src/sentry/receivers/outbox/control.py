@@ -46,6 +46,7 @@ def process_integration_updates(object_identifier: int, region_name: str, **kwds
 
 @receiver(process_control_outbox, sender=OutboxCategory.SENTRY_APP_UPDATE)
 def process_sentry_app_updates(object_identifier: int, region_name: str, **kwds: Any):
+    from sentry.incidents.logic import get_available_actions
 
     if (
         sentry_app := maybe_process_tombstone(
@@ -80,6 +81,11 @@ def process_sentry_app_updates(object_identifier: int, region_name: str, **kwds:
             region_caching_service.clear_key(
                 key=get_installation.key_from(install_id), region_name=region_name
             )
+        # The app may have become (un)alertable or changed its alert-rule-action component.
+        region_caching_service.clear_key(
+            key=get_available_actions.key_from(region_row["organization_id"]),
+            region_name=region_name,
+        )
 
 
 @receiver(process_control_outbox, sender=OutboxCategory.API_APPLICATION_UPDATE)
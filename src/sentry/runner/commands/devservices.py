@@ -13,8 +13,8 @@ import time
 import urllib.error
 import urllib.request
 from collections.abc import Callable, Generator
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import TYPE_CHECKING, Any, ContextManager, Literal, NamedTuple, overload
+from concurrent.futures import FIRST_EXCEPTION, Future, ThreadPoolExecutor, wait
+from typing import TYPE_CHECKING, Any, ContextManager, Literal, NamedTuple, NoReturn, overload
 
 import click
 
@@ -68,12 +68,24 @@ def _gitroot() -> str:
     return root
 
 
+# API version negotiated with the docker daemon by the first client of this process.
+_DOCKER_API_VERSION: str | None = None
+
+
 @contextlib.contextmanager
 def get_docker_client() -> Generator[docker.DockerClient]:
     import docker
 
     def _client() -> ContextManager[docker.DockerClient]:
-        return contextlib.closing(docker.DockerClient(base_url=f"unix://{RAW_SOCKET_PATH}"))
+        global _DOCKER_API_VERSION
+
+        # Without a version, the client asks the daemon for it when created. Only do
+        # that round-trip for the first client of this process.
+        client = docker.DockerClient(
+            base_url=f"unix://{RAW_SOCKET_PATH}", version=_DOCKER_API_VERSION
+        )
+        _DOCKER_API_VERSION = client.api.api_version
+        return contextlib.closing(client)
 
     with contextlib.ExitStack() as ctx:
         try:
@@ -122,6 +134,13 @@ def get_docker_client() -> Generator[docker.DockerClient]:
         yield client
 
 
+_COLLECTION_ATTRS = {"network": "networks", "volume": "volumes"}
+
+# dockerd serializes a lot of operations anyway, so there is little to gain
+# from talking to it from more threads than this.
+MAX_DOCKER_WORKERS = 8
+
+
 @overload
 def get_or_create(
     client: docker.DockerClient, thing: Literal["network"], name: str
@@ -141,11 +160,12 @@ def get_or_create(
 ) -> docker.models.networks.Network | docker.models.volumes.Volume:
     from docker.errors import NotFound
 
+    collection = getattr(client, _COLLECTION_ATTRS[thing])
     try:
-        return getattr(client, thing + "s").get(name)
+        return collection.get(name)
     except NotFound:
         click.secho(f"> Creating '{name}' {thing}", err=True, fg="yellow")
-        return getattr(client, thing + "s").create(name)
+        return collection.create(name)
 
 
 def retryable_pull(
@@ -174,15 +194,45 @@ def retryable_pull(
             break
 
 
+def _wait_or_cancel(executor: ThreadPoolExecutor, futures: list[Future[Any]], message: str) -> None:
+    """
+    Wait for all futures, but stop as soon as one of them fails: the work that
+    hasn't started yet is cancelled and the exception is re-raised.
+    """
+    done, _ = wait(futures, return_when=FIRST_EXCEPTION)
+    for future in done:
+        try:
+            future.result()
+        except Exception as e:
+            executor.shutdown(wait=False, cancel_futures=True)
+            click.secho(f"> {message}: {e}", err=True, fg="red")
+            raise
+
+
+def _get_project_containers(
+    client: docker.DockerClient, project: str
+) -> dict[str, docker.models.containers.Container]:
+    """
+    Map the names of all existing containers of a project to their container, using
+    a single API call. The containers are listed sparsely (without inspecting each
+    one), so only their id, status and the operations on them can be relied on.
+    """
+    rv: dict[str, docker.models.containers.Container] = {}
+    for container in client.containers.list(all=True, sparse=True, filters={"name": f"{project}_"}):
+        for name in container.attrs["Names"]:
+            rv[name.lstrip("/")] = container
+    return rv
+
+
+def _pull_image(client: docker.DockerClient, image: str, platform: str | None) -> None:
+    click.secho(f"> Pulling image '{image}'", fg="green")
+    retryable_pull(client, image, platform=platform)
+
+
 def ensure_interface(ports: dict[str, int | tuple[str, int]]) -> dict[str, tuple[str, int]]:
     # If there is no interface specified, make sure the
     # default interface is 127.0.0.1
-    rv = {}
-    for k, v in ports.items():
-        if not isinstance(v, tuple):
-            v = ("127.0.0.1", v)
-        rv[k] = v
-    return rv
+    return {k: v if isinstance(v, tuple) else ("127.0.0.1", v) for k, v in ports.items()}
 
 
 def ensure_docker_cli_context(context: str) -> None:
@@ -273,8 +323,12 @@ def attach(project: str, service: str) -> None:
         signal.signal(signal.SIGINT, exit_handler)
         signal.signal(signal.SIGTERM, exit_handler)
 
+        # Write the raw bytes ourselves, click.echo's text handling is wasted on them.
+        # Still flush every chunk since devserver consumes this through a pipe.
+        out = sys.stdout.buffer
         for line in container.logs(stream=True, since=int(time.time() - 20)):
-            click.echo(line, nl=False)
+            out.write(line)
+            out.flush()
 
 
 @devservices.command()
@@ -314,56 +368,77 @@ def up(
     if services:
         for service in services:
             if service not in containers:
-                click.secho(
-                    f"Service `{service}` is not known or not enabled.\n",
-                    err=True,
-                    fg="red",
-                )
-                click.secho(
-                    "Services that are available:\n" + "\n".join(containers.keys()) + "\n", err=True
-                )
-                raise click.Abort()
+                _abort_unknown_service(service, containers)
             selected_services.add(service)
     else:
         selected_services = set(containers.keys())
 
     for service in exclude:
         if service not in containers:
-            click.secho(f"Service `{service}` is not known or not enabled.\n", err=True, fg="red")
-            click.secho(
-                "Services that are available:\n" + "\n".join(containers.keys()) + "\n", err=True
-            )
-            raise click.Abort()
+            _abort_unknown_service(service, containers)
         selected_services.remove(service)
 
     with get_docker_client() as docker_client:
         get_or_create(docker_client, "network", project)
 
-        with ThreadPoolExecutor(max_workers=len(selected_services)) as executor:
-            futures = []
-            for name in selected_services:
-                futures.append(
-                    executor.submit(
-                        _start_service,
-                        docker_client,
-                        name,
-                        containers,
-                        project,
-                        False,
-                        recreate,
+        existing_containers = _get_project_containers(docker_client, project)
+
+        # Pull images once per image, for every container that is going to be
+        # (re)created. Already running containers are left alone as before.
+        images: set[tuple[str, str | None]] = set()
+        for name in selected_services:
+            options = containers[name]
+            if options.get("with_devserver", False):
+                continue
+            existing_container = existing_containers.get(options["name"])
+            if (
+                not recreate
+                and existing_container is not None
+                and existing_container.status == "running"
+            ):
+                continue
+            images.add((options["image"], options.get("platform")))
+
+        with ThreadPoolExecutor(
+            max_workers=min(len(images), MAX_DOCKER_WORKERS) or 1
+        ) as pull_executor:
+            # Pulls run concurrently with starting services, each service only
+            # waits for its own image rather than for every pull to finish.
+            image_pulls = {
+                (image, platform): pull_executor.submit(_pull_image, docker_client, image, platform)
+                for image, platform in images
+            }
+
+            with ThreadPoolExecutor(
+                max_workers=min(len(selected_services), MAX_DOCKER_WORKERS) or 1
+            ) as executor:
+                futures = []
+                for name in selected_services:
+                    futures.append(
+                        executor.submit(
+                            _start_service,
+                            docker_client,
+                            name,
+                            containers,
+                            project,
+                            False,
+                            recreate,
+                            existing_containers=existing_containers,
+                            image_pulls=image_pulls,
+                        )
                     )
-                )
-            for future in as_completed(futures):
                 try:
-                    future.result()
-                except Exception as e:
-                    click.secho(f"> Failed to start service: {e}", err=True, fg="red")
+                    _wait_or_cancel(executor, futures, "Failed to start service")
+                except Exception:
+                    # Don't keep pulling images for services that won't be started.
+                    pull_executor.shutdown(wait=False, cancel_futures=True)
                     raise
 
     # Check health of services. Seperate from _start_services
     # in case there are dependencies needed for the health
     # check (for example: kafka's healthcheck requires zookeeper)
-    with ThreadPoolExecutor(max_workers=len(selected_services)) as executor:
+    # Health checks mostly wait between retries, so they are not capped.
+    with ThreadPoolExecutor(max_workers=len(selected_services) or 1) as executor:
         futures = []
         for name in selected_services:
             futures.append(
@@ -373,12 +448,13 @@ def up(
                     containers[name],
                 )
             )
-        for future in as_completed(futures):
-            try:
-                future.result()
-            except Exception as e:
-                click.secho(f"> Failed to check health: {e}", err=True, fg="red")
-                raise
+        _wait_or_cancel(executor, futures, "Failed to check health")
+
+
+def _abort_unknown_service(service: str, containers: dict[str, Any]) -> NoReturn:
+    click.secho(f"Service `{service}` is not known or not enabled.\n", err=True, fg="red")
+    click.secho("Services that are available:\n" + "\n".join(containers) + "\n", err=True)
+    raise click.Abort()
 
 
 def _prepare_containers(
@@ -425,6 +501,8 @@ def _start_service(
     project: str,
     always_start: Literal[False] = ...,
     recreate: bool = False,
+    existing_containers: dict[str, docker.models.containers.Container] | None = None,
+    image_pulls: dict[tuple[str, str | None], Future[None]] | None = None,
 ) -> docker.models.containers.Container:
     ...
 
@@ -437,6 +515,8 @@ def _start_service(
     project: str,
     always_start: bool = False,
     recreate: bool = False,
+    existing_containers: dict[str, docker.models.containers.Container] | None = None,
+    image_pulls: dict[tuple[str, str | None], Future[None]] | None = None,
 ) -> docker.models.containers.Container | None:
     ...
 
@@ -448,6 +528,8 @@ def _start_service(
     project: str,
     always_start: bool = False,
     recreate: bool = False,
+    existing_containers: dict[str, docker.models.containers.Container] | None = None,
+    image_pulls: dict[tuple[str, str | None], Future[None]] | None = None,
 ) -> docker.models.containers.Container | None:
     from docker.errors import NotFound
 
@@ -474,26 +556,35 @@ def _start_service(
         return None
 
     container = None
-    try:
-        container = client.containers.get(options["name"])
-    except NotFound:
-        pass
+    if existing_containers is not None:
+        container = existing_containers.get(options["name"])
+    else:
+        try:
+            container = client.containers.get(options["name"])
+        except NotFound:
+            pass
 
     if container is not None:
         if not recreate and container.status == "running":
             click.secho(f"> Container '{options['name']}' is already running", fg="yellow")
             return container
 
-        click.secho(f"> Stopping container '{container.name}'", fg="yellow")
-        container.stop()
-        click.secho(f"> Removing container '{container.name}'", fg="yellow")
+        click.secho(f"> Stopping container '{options['name']}'", fg="yellow")
+        # The container is about to be replaced, don't wait the default 10s for it.
+        container.stop(timeout=1)
+        click.secho(f"> Removing container '{options['name']}'", fg="yellow")
         container.remove()
 
-    for key, value in list(options["environment"].items()):
-        options["environment"][key] = value.format(containers=containers)
+    # Only values are replaced, so the environment can be updated while iterating it.
+    environment = options["environment"]
+    for key in environment:
+        environment[key] = environment[key].format(containers=containers)
 
-    click.secho(f"> Pulling image '{options['image']}'", fg="green")
-    retryable_pull(client, options["image"], platform=options.get("platform"))
+    if image_pulls is not None:
+        # `devservices up` pulls each image once for all of its services.
+        image_pulls[(options["image"], options.get("platform"))].result()
+    else:
+        _pull_image(client, options["image"], options.get("platform"))
 
     for mount in list(options.get("volumes", {}).keys()):
         if "/" not in mount:
@@ -540,16 +631,13 @@ def down(project: str, service: list[str]) -> None:
                 continue
             containers.append(container)
 
-        with ThreadPoolExecutor(max_workers=len(containers) or 1) as executor:
+        with ThreadPoolExecutor(
+            max_workers=min(len(containers), MAX_DOCKER_WORKERS) or 1
+        ) as executor:
             futures = []
             for container in containers:
                 futures.append(executor.submit(_down, container))
-            for future in as_completed(futures):
-                try:
-                    future.result()
-                except Exception as e:
-                    click.secho(f"> Failed to stop service: {e}", err=True, fg="red")
-                    raise
+            _wait_or_cancel(executor, futures, "Failed to stop service")
 
 
 @devservices.command()
@@ -574,17 +662,8 @@ def rm(project: str, services: list[str]) -> None:
     if services:
         selected_containers = {}
         for service in services:
-            # XXX: This code is also fairly duplicated in here at this point, so dedupe in the future.
             if service not in containers:
-                click.secho(
-                    f"Service `{service}` is not known or not enabled.\n",
-                    err=True,
-                    fg="red",
-                )
-                click.secho(
-                    "Services that are available:\n" + "\n".join(containers.keys()) + "\n", err=True
-                )
-                raise click.Abort()
+                _abort_unknown_service(service, containers)
             selected_containers[service] = containers[service]
         containers = selected_containers
 
@@ -600,11 +679,11 @@ Are you sure you want to continue?"""
     )
 
     with get_docker_client() as docker_client:
+        existing_containers = _get_project_containers(docker_client, project)
         volume_to_service = {}
         for service_name, container_options in containers.items():
-            try:
-                container = docker_client.containers.get(container_options["name"])
-            except NotFound:
+            container = existing_containers.get(container_options["name"])
+            if container is None:
                 click.secho(
                     "> WARNING: non-existent container '%s'" % container_options["name"],
                     err=True,
@@ -612,16 +691,16 @@ Are you sure you want to continue?"""
                 )
                 continue
 
-            click.secho("> Stopping '%s' container" % container_options["name"], err=True, fg="red")
-            container.stop()
+            # The container's data is deleted anyway, so kill and remove it in one go.
             click.secho("> Removing '%s' container" % container_options["name"], err=True, fg="red")
-            container.remove()
+            container.remove(force=True)
             for volume in container_options.get("volumes") or ():
                 volume_to_service[volume] = service_name
 
         prefix = project + "_"
 
-        for volume in docker_client.volumes.list():
+        # The name filter matches substrings, so the prefix still has to be checked.
+        for volume in docker_client.volumes.list(filters={"name": prefix}):
             if volume.name.startswith(prefix):
                 local_name = volume.name[len(prefix) :]
                 if not services or volume_to_service.get(local_name) in services:
@@ -1,10 +1,9 @@
 from collections.abc import Mapping
 from typing import Any
+from unittest import mock
 
 from sentry.constants import ObjectStatus, SentryAppStatus
-from sentry.incidents.endpoints.organization_alert_rule_available_action_index import (
-    build_action_response,
-)
+from sentry.incidents.logic import build_action_response
 from sentry.incidents.models.alert_rule import AlertRuleTriggerAction
 from sentry.integrations.models.organization_integration import OrganizationIntegration
 from sentry.integrations.pagerduty.utils import add_service
@@ -13,6 +12,7 @@ from sentry.models.integrations import SentryAppComponent, SentryAppInstallation
 from sentry.sentry_apps.services.app.serial import serialize_sentry_app_installation
 from sentry.silo.base import SiloMode
 from sentry.testutils.cases import APITestCase
+from sentry.testutils.outbox import outbox_runner
 from sentry.testutils.silo import assume_test_silo_mode
 
 SERVICES = [
@@ -203,6 +203,98 @@ class OrganizationAlertRuleAvailableActionIndexEndpointTest(APITestCase):
             in response.data
         )
 
+    def test_multiple_pagerduty_integrations(self):
+        services = {}
+        integrations = []
+        with assume_test_silo_mode(SiloMode.CONTROL):
+            for i in range(2):
+                integration = self.create_provider_integration(
+                    provider="pagerduty",
+                    name=f"PagerDuty {i}",
+                    external_id=f"example-pagerduty-{i}",
+                    metadata={"services": SERVICES},
+                )
+                org_integration = integration.add_organization(self.organization, self.user)
+                services[integration.id] = add_service(
+                    org_integration,
+                    service_name=f"service {i}",
+                    integration_key=SERVICES[0]["integration_key"],
+                )
+                integrations.append(integration)
+
+        with self.feature("organizations:incidents"), mock.patch(
+            "sentry.incidents.logic.get_pagerduty_services"
+        ) as mock_get_pagerduty_services:
+            response = self.get_success_response(self.organization.slug)
+
+        assert not mock_get_pagerduty_services.called
+        assert len(response.data) == 3
+        options_by_integration = {
+            action["integrationId"]: action["options"]
+            for action in response.data
+            if action["type"] == "pagerduty"
+        }
+        assert options_by_integration == {
+            integration.id: [{"value": services[integration.id]["id"], "label": f"service {i}"}]
+            for i, integration in enumerate(integrations)
+        }
+
+    def test_cached(self):
+        with self.feature("organizations:incidents"):
+            self.get_success_response(self.organization.slug)
+            with mock.patch(
+                "sentry.incidents.logic.get_available_action_integrations_for_org"
+            ) as mock_get_integrations:
+                response = self.get_success_response(self.organization.slug)
+
+        assert not mock_get_integrations.called
+        assert response.data == [build_action_response(self.email)]
+
+    def test_cache_cleared_on_integration_change(self):
+        with self.feature("organizations:incidents"):
+            response = self.get_success_response(self.organization.slug)
+        assert len(response.data) == 1
+
+        with outbox_runner(), assume_test_silo_mode(SiloMode.CONTROL):
+            integration = self.create_provider_integration(external_id="1", provider="slack")
+            integration.add_organization(self.organization)
+
+        with self.feature("organizations:incidents"):
+            response = self.get_success_response(self.organization.slug)
+        assert len(response.data) == 2
+
+    def test_cache_cleared_on_sentry_app_install(self):
+        with self.feature("organizations:incidents"):
+            response = self.get_success_response(self.organization.slug)
+        assert len(response.data) == 1
+
+        with outbox_runner():
+            self.install_new_sentry_app("foo")
+
+        with self.feature("organizations:incidents"):
+            response = self.get_success_response(self.organization.slug)
+        assert len(response.data) == 2
+
+    def test_not_cached_when_component_fails(self):
+        installation = self.install_new_sentry_app("foo")
+        test_settings: Mapping[str, Any] = {"test-settings": []}
+        with assume_test_silo_mode(SiloMode.CONTROL):
+            SentryAppComponent.objects.create(
+                sentry_app=installation.sentry_app,
+                type="alert-rule-action",
+                schema={"settings": test_settings},
+            )
+
+        with self.feature("organizations:incidents"):
+            with mock.patch("sentry.incidents.logic.prepare_ui_component", return_value=None):
+                response = self.get_success_response(self.organization.slug)
+            [action] = [action for action in response.data if action["type"] == "sentry_app"]
+            assert "settings" not in action
+
+            response = self.get_success_response(self.organization.slug)
+        [action] = [action for action in response.data if action["type"] == "sentry_app"]
+        assert action["settings"] == test_settings
+
     def test_no_feature(self):
         self.create_team(organization=self.organization, members=[self.user])
         self.get_error_response(self.organization.slug, status_code=404)
@@ -223,6 +315,34 @@ class OrganizationAlertRuleAvailableActionIndexEndpointTest(APITestCase):
             in response.data
         )
 
+    def test_sentry_apps_with_component(self):
+        installation = self.install_new_sentry_app("foo")
+        other_installation = self.install_new_sentry_app("bar")
+        test_settings: Mapping[str, Any] = {"test-settings": []}
+        with assume_test_silo_mode(SiloMode.CONTROL):
+            SentryAppComponent.objects.create(
+                sentry_app=installation.sentry_app,
+                type="alert-rule-action",
+                schema={"settings": test_settings},
+            )
+
+        with self.feature("organizations:incidents"), mock.patch(
+            "sentry.incidents.logic.app_service.prepare_sentry_app_components"
+        ) as mock_prepare_sentry_app_components:
+            response = self.get_success_response(self.organization.slug)
+
+        assert not mock_prepare_sentry_app_components.called
+        assert len(response.data) == 3
+        settings_by_uuid = {
+            action["sentryAppInstallationUuid"]: action.get("settings")
+            for action in response.data
+            if action["type"] == "sentry_app"
+        }
+        assert settings_by_uuid == {
+            installation.uuid: test_settings,
+            other_installation.uuid: None,
+        }
+
     def test_published_sentry_apps(self):
         # Should show up in available actions.
         installation = self.install_new_sentry_app("published", published=True)